@@ -12,17 +12,35 @@ from transformers import (
     PreTrainedTokenizer
 )
 from schemas import NLUResult, Entities
-from llama_prompt import SYSTEM_PROMPT
+from llama_prompt import SYSTEM_PROMPT, COMPACT_SYSTEM_PROMPT
 from validator import validate_nlu_result 
 
 # --- AUTHENTICATION ---
 HF_TOKEN = "" 
 login(token=HF_TOKEN)
 
+MODEL_ID = "meta-llama/Meta-Llama-3.1-8B-Instruct"
+
+# Compact prompt trims ~237 prefill tokens (9%) on every request (see prompt_profiler.py).
+# Stays off until `python prompt_profiler.py --eval` shows compact matches the full
+# prompt on intent, entity and exact-match accuracy over labeled_corpus.py.
+USE_COMPACT_PROMPT = False
+
 # --- Singleton Logic ---
 _global_pipeline: Optional[Pipeline] = None
 _global_tokenizer: Optional[PreTrainedTokenizer] = None
 
+def load_tokenizer() -> PreTrainedTokenizer:
+    """Tokenizer only, without loading model weights (used by the prompt profiler)."""
+    global _global_tokenizer
+
+    if _global_tokenizer is not None:
+        return _global_tokenizer
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID, token=HF_TOKEN)
+    tokenizer.pad_token = tokenizer.eos_token
+    _global_tokenizer = tokenizer
+    return tokenizer
+
 def load_resources() -> Tuple[Pipeline, PreTrainedTokenizer]:
     global _global_pipeline, _global_tokenizer
     
@@ -34,8 +52,6 @@ def load_resources() -> Tuple[Pipeline, PreTrainedTokenizer]:
 
     print("Loading Llama-3.1 Model...")
     
-    model_id = "meta-llama/Meta-Llama-3.1-8B-Instruct"
-
     bnb_config = BitsAndBytesConfig(
         load_in_4bit=True,
         bnb_4bit_quant_type="nf4",
@@ -43,11 +59,10 @@ def load_resources() -> Tuple[Pipeline, PreTrainedTokenizer]:
         bnb_4bit_use_double_quant=True,
     )
 
-    tokenizer = AutoTokenizer.from_pretrained(model_id, token=HF_TOKEN)
-    tokenizer.pad_token = tokenizer.eos_token
+    tokenizer = load_tokenizer()
 
     model = AutoModelForCausalLM.from_pretrained(
-        model_id,
+        MODEL_ID,
         quantization_config=bnb_config,
         device_map="auto",
         trust_remote_code=True,
@@ -99,11 +114,14 @@ def _repair_json_string(json_str: str) -> str:
     
     return json_str
 
-def llama_nlu(text: str) -> NLUResult:
+def llama_nlu(text: str, system_prompt: Optional[str] = None, greedy: bool = False) -> NLUResult:
     generator, tokenizer = load_resources()
 
+    if system_prompt is None:
+        system_prompt = COMPACT_SYSTEM_PROMPT if USE_COMPACT_PROMPT else SYSTEM_PROMPT
+
     messages = [
-        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "system", "content": system_prompt},
         {"role": "user", "content": text},
     ]
     
@@ -114,7 +132,11 @@ def llama_nlu(text: str) -> NLUResult:
     ))
 
     try:
-        raw_result = generator(prompt)
+        # greedy=True makes output deterministic, so prompt comparisons aren't sampling noise
+        if greedy:
+            raw_result = generator(prompt, do_sample=False, temperature=None, top_p=None)
+        else:
+            raw_result = generator(prompt)
         outputs = cast(List[Dict[str, Any]], raw_result)
         raw_output = str(outputs[0]["generated_text"])
         
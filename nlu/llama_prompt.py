@@ -1,49 +1,128 @@
+import re
+from typing import List, Tuple
 from intents import MASTER_INTENTS
 
-def build_system_prompt() -> str:
-    prompt = """You are Viora, an intelligent NLU assistant for blind students.
+# A prompt part is (kind, owner, text). 'owner' is the intent name, or "global"
+# for text shared by all intents. The profiler uses this to attribute tokens.
+PromptPart = Tuple[str, str, str]
+
+GLOBAL_RULES = [
+    "ARABIC INTEGRITY: Copy Arabic text EXACTLY as spoken. Do not rephrase. Do not translate.",
+    "DATA TYPES: 'page_number' MUST be an Integer (e.g., 15).",
+    "DATA TYPES: 'file_types' MUST be a List of strings (e.g., ['pdf']).",
+]
+
+_RULE_LABEL = re.compile(r"^([A-Z][A-Z ]+):\s*")
+
+_CODE_IDENTIFIER = re.compile(r"`(\w+)`")
+_CODE_LITERAL = re.compile(r"`([^`]+)`")
+
+def _strip_markdown(text: str) -> str:
+    """
+    Removes bold markers and backticks around identifiers (`page_number`).
+    Backticks around literals (`,` or `}}`) become quotes so the literal stays visible.
+    """
+    text = text.replace("**", "")
+    text = _CODE_IDENTIFIER.sub(r"\1", text)
+    return _CODE_LITERAL.sub(r"'\1'", text)
+
+def _merge_labelled_rules(rules: List[str]) -> List[str]:
+    """Merge consecutive rules sharing a label, e.g. two 'SPECIAL VALUES:' lines."""
+    merged: List[str] = []
+    prev_label = None
+    for rule in rules:
+        match = _RULE_LABEL.match(rule)
+        label = match.group(1) if match else None
+        if label and label == prev_label:
+            merged[-1] += " " + rule[match.end():]
+        else:
+            merged.append(rule)
+        prev_label = label
+    return merged
+
+def build_prompt_parts(compact: bool = False) -> List[PromptPart]:
+    """
+    Renders the system prompt as an ordered list of attributed parts.
+    compact=True merges rules that share a label, strips markdown and renders
+    definitions/examples on single lines.
+    """
+    md = _strip_markdown if compact else (lambda text: text)
+    parts: List[PromptPart] = []
+
+    def section(title: str) -> str:
+        return f"\n{title}:\n" if compact else f"\n### {title}\n"
+
+    parts.append(("header", "global", """You are Viora, an intelligent NLU assistant for blind students.
 Your task: Analyze the user's spoken command (Arabic/English) and output structured JSON.
+"""))
 
-### 1. INTENT & ENTITY DEFINITIONS
-"""
+    # 1. Definitions
+    parts.append(("header", "global", section("1. INTENT & ENTITY DEFINITIONS")))
     for intent in MASTER_INTENTS:
-        prompt += f"\n**{intent.name}**: {intent.description}\n"
+        if compact:
+            text = f"{intent.name}: {intent.description}"
+            if intent.entities:
+                text += " Entities: " + " ".join(f"{k} ({v})" for k, v in intent.entities.items())
+            parts.append(("definition", intent.name, text + "\n"))
+            continue
+        text = f"\n**{intent.name}**: {intent.description}\n"
         if intent.entities:
-            prompt += "   Expected Entities:\n"
+            text += "   Expected Entities:\n"
             for ent_name, ent_desc in intent.entities.items():
-                prompt += f"   - `{ent_name}`: {ent_desc}\n"
+                text += f"   - `{ent_name}`: {ent_desc}\n"
+        parts.append(("definition", intent.name, text))
 
-    prompt += "\n### 2. CONFIDENCE SCORING GUIDE\n"
-    prompt += "- **0.9 - 1.0**: High Confidence. The intent is clear. NOTE: Dialect (Egyptian) and Mixed Arabic/English (Code-Switching) are considered VALID and should score high (0.9+).\n"
-    prompt += "- **0.7 - 0.8**: Medium Confidence. Intent is understood but contains typos, stuttering, or grammar errors.\n"
-    prompt += "- **< 0.7**: Low Confidence. Ambiguous intent or missing REQUIRED entities (set 'needs_clarification': true).\n"
+    # 2. Scoring
+    parts.append(("header", "global", section("2. CONFIDENCE SCORING GUIDE")))
+    parts.append(("scoring", "global", md(
+        "- **0.9 - 1.0**: High Confidence. The intent is clear. NOTE: Dialect (Egyptian) and Mixed Arabic/English (Code-Switching) are considered VALID and should score high (0.9+).\n"
+        "- **0.7 - 0.8**: Medium Confidence. Intent is understood but contains typos, stuttering, or grammar errors.\n"
+        "- **< 0.7**: Low Confidence. Ambiguous intent or missing REQUIRED entities (set 'needs_clarification': true).\n"
+    )))
 
-    prompt += "\n### 3. SMART REASONING RULES\n"
-    prompt += "- ARABIC INTEGRITY: Copy Arabic text EXACTLY as spoken. Do not rephrase. Do not translate.\n"
-    prompt += "- DATA TYPES: 'page_number' MUST be an Integer (e.g., 15).\n"
-    prompt += "- DATA TYPES: 'file_types' MUST be a List of strings (e.g., ['pdf']).\n"
+    # 3. Rules
+    parts.append(("header", "global", section("3. SMART REASONING RULES")))
+    global_rules = _merge_labelled_rules(GLOBAL_RULES) if compact else GLOBAL_RULES
+    for rule in global_rules:
+        parts.append(("rule", "global", f"- {rule}\n"))
 
-    # Specific Rules
     for intent in MASTER_INTENTS:
-        if intent.rules:
-            prompt += f"\n**{intent.name.upper()} Rules:**\n"
-            for rule in intent.rules:
-                prompt += f"- {rule}\n"
+        rules = _merge_labelled_rules(intent.rules) if compact else intent.rules
+        if not rules:
+            continue
+        if compact:
+            parts.append(("header", intent.name, f"{intent.name}:\n"))
+        else:
+            parts.append(("header", intent.name, f"\n**{intent.name.upper()} Rules:**\n"))
+        for rule in rules:
+            parts.append(("rule", intent.name, f"- {md(rule)}\n"))
 
-    prompt += "\n### 4. EXAMPLES (Few-Shot Learning)\n"
+    # 4. Examples
+    parts.append(("header", "global", section("4. EXAMPLES (Few-Shot Learning)")))
     for intent in MASTER_INTENTS:
         for ex in intent.examples:
-            prompt += f'\nUser: "{ex["user"]}"\n'
-            prompt += f'Output:\n{ex["json"]}\n'
+            # Compact keeps the spaced JSON: _repair_json_string needs whitespace to find missing commas
+            if compact:
+                text = f'"{ex["user"]}" -> {ex["json"]}\n'
+            else:
+                text = f'\nUser: "{ex["user"]}"\nOutput:\n{ex["json"]}\n'
+            parts.append(("example", intent.name, text))
 
     # --- NEW CRITICAL SECTION ---
-    prompt += "\n### 5. CRITICAL JSON SYNTAX RULES (MUST FOLLOW)\n"
-    prompt += "1. **COMMAS**: You MUST place a comma `,` after every key-value pair. Example: `\"confidence\": 0.9, \"entities\": ...`\n"
-    prompt += "2. **CLOSURE**: You MUST close the JSON object with `}}`. Do not stop early.\n"
-    prompt += "3. **NO TRAILING COMMAS**: Do not put a comma after the last item in a list or object.\n"
-    prompt += "4. **PURE JSON**: Output ONLY the JSON string. No markdown, no explanations.\n"
-    
-    prompt += "\n### REAL TASK:\nAnalyze the following user input and return the VALID JSON.\n"
-    return prompt
-
-SYSTEM_PROMPT = build_system_prompt()
\ No newline at end of file
+    parts.append(("header", "global", section("5. CRITICAL JSON SYNTAX RULES (MUST FOLLOW)")))
+    parts.append(("syntax", "global", md(
+        "1. **COMMAS**: You MUST place a comma `,` after every key-value pair. Example: `\"confidence\": 0.9, \"entities\": ...`\n"
+        "2. **CLOSURE**: You MUST close the JSON object with `}}`. Do not stop early.\n"
+        "3. **NO TRAILING COMMAS**: Do not put a comma after the last item in a list or object.\n"
+        "4. **PURE JSON**: Output ONLY the JSON string. No markdown, no explanations.\n"
+    )))
+
+    task_header = "\nREAL TASK:\n" if compact else "\n### REAL TASK:\n"
+    parts.append(("task", "global", task_header + "Analyze the following user input and return the VALID JSON.\n"))
+    return parts
+
+def build_system_prompt(compact: bool = False) -> str:
+    return "".join(text for _, _, text in build_prompt_parts(compact))
+
+SYSTEM_PROMPT = build_system_prompt()
+COMPACT_SYSTEM_PROMPT = build_system_prompt(compact=True)
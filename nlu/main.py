@@ -1,9 +1,10 @@
 import time
 import arabic_reshaper
-from typing import cast
+from typing import cast, Optional
 from bidi.algorithm import get_display
 from llama_nlu import llama_nlu
 from router import route_nlu_result
+from labeled_corpus import LABELED_CORPUS
 
 # ANSI colors
 GREEN = "\033[92m"
@@ -19,7 +20,7 @@ def fix_text(text: str) -> str:
         return cast(str, get_display(reshaped))
     except: return text
 
-def test_command(text: str):
+def test_command(text: str, expected_intent: Optional[str] = None):
     display_text = fix_text(text)
     print(f"\n{YELLOW}User says:{RESET} '{display_text}'")
     
@@ -34,6 +35,8 @@ def test_command(text: str):
     print(f"   Time: {duration:.2f}s")
     print(f"   Decision: {color}{decision}{RESET}")
     print(f"   Intent: {payload.intent} (Conf: {payload.confidence:.2f})")
+    if expected_intent and payload.intent != expected_intent:
+        print(f"   {RED}Expected: {expected_intent}{RESET}")
     
     # Clean display of entities
     ents = payload.entities.model_dump(exclude_none=True)
@@ -119,4 +122,9 @@ if __name__ == "__main__":
     for category, commands in test_suite.items():
         print(f"\n{CYAN}--- {category} ---{RESET}")
         for cmd in commands:
-            test_command(cmd)
\ No newline at end of file
+            test_command(cmd)
+
+    # Labeled commands (shared with prompt_profiler.py --eval)
+    print(f"\n{CYAN}--- 16. Labeled Corpus ---{RESET}")
+    for item in LABELED_CORPUS:
+        test_command(item["user"], item["intent"])
\ No newline at end of file
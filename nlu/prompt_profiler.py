@@ -0,0 +1,150 @@
+import sys
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List
+from llama_prompt import PromptPart, build_prompt_parts
+from labeled_corpus import LABELED_CORPUS
+
+if TYPE_CHECKING:
+    from transformers import PreTrainedTokenizer
+    from schemas import NLUResult
+
+# llama_nlu is imported inside the functions that need it: importing it logs in
+# to the Hub and pulls in torch, which the token counting itself doesn't need.
+
+def count_part_tokens(tokenizer: "PreTrainedTokenizer", parts: List[PromptPart]) -> List[int]:
+    """
+    Tokenizes the rendered prompt ONCE and assigns each token to the part its
+    first character falls in. Tokenizing parts separately would over-count
+    tokens that merge across part boundaries.
+    """
+    prompt = "".join(text for _, _, text in parts)
+    encoding = tokenizer(prompt, add_special_tokens=False, return_offsets_mapping=True)
+
+    ends = []
+    pos = 0
+    for _, _, text in parts:
+        pos += len(text)
+        ends.append(pos)
+
+    counts = [0] * len(parts)
+    idx = 0
+    for start, _ in encoding["offset_mapping"]:
+        while idx < len(ends) - 1 and start >= ends[idx]:
+            idx += 1
+        counts[idx] += 1
+    return counts
+
+def prefill_tokens(tokenizer: "PreTrainedTokenizer", system_prompt: str) -> int:
+    """Tokens the model prefills before any user text (system turn + chat template)."""
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": ""},
+    ]
+    return len(tokenizer.apply_chat_template(messages, tokenize=True, add_generation_prompt=True))
+
+def profile_prompt(tokenizer: "PreTrainedTokenizer", compact: bool = False) -> Dict:
+    parts = build_prompt_parts(compact)
+    counts = count_part_tokens(tokenizer, parts)
+
+    by_kind: Dict[str, int] = defaultdict(int)
+    by_owner: Dict[str, int] = defaultdict(int)
+    for (kind, owner, _), n in zip(parts, counts):
+        by_kind[kind] += n
+        by_owner[owner] += n
+
+    system_prompt = "".join(text for _, _, text in parts)
+    return {
+        "parts": list(zip(parts, counts)),
+        "by_kind": dict(by_kind),
+        "by_owner": dict(by_owner),
+        "total": sum(counts),
+        "prefill": prefill_tokens(tokenizer, system_prompt),
+        "system_prompt": system_prompt,
+    }
+
+def run_corpus(system_prompt: str, corpus: List[Dict[str, Any]] = LABELED_CORPUS) -> List["NLUResult"]:
+    """Runs every labeled command with greedy decoding, so two prompts can be compared item by item."""
+    from llama_nlu import llama_nlu
+    return [llama_nlu(item["user"], system_prompt=system_prompt, greedy=True) for item in corpus]
+
+def result_key(result: "NLUResult") -> Dict[str, Any]:
+    """The parts of a validated result that are compared (confidence is not)."""
+    return {
+        "intent": result.intent,
+        "entities": result.entities.model_dump(exclude_none=True),
+        "needs_clarification": result.needs_clarification,
+    }
+
+def score_results(results: List["NLUResult"], corpus: List[Dict[str, Any]] = LABELED_CORPUS) -> Dict[str, float]:
+    """
+    intent:   intent matches the label.
+    entities: every labeled entity key has the labeled value, over items that label entities.
+    exact:    intent, entities and needs_clarification all match.
+    """
+    intent_ok = entities_ok = exact_ok = with_entities = 0
+    for result, item in zip(results, corpus):
+        actual = result.entities.model_dump()
+        intent_match = result.intent == item["intent"]
+        entities_match = all(actual.get(k) == v for k, v in item["entities"].items())
+        clarify_match = result.needs_clarification == item.get("needs_clarification", False)
+
+        intent_ok += intent_match
+        if item["entities"]:
+            with_entities += 1
+            entities_ok += entities_match
+        exact_ok += intent_match and entities_match and clarify_match
+
+    n = len(corpus)
+    return {"intent": intent_ok / n, "entities": entities_ok / max(with_entities, 1), "exact": exact_ok / n}
+
+def print_profile(title: str, profile: Dict, top: int = 10):
+    print(f"\n=== {title}: {profile['total']} prompt tokens, {profile['prefill']} prefill tokens ===")
+
+    print("By section:")
+    for kind, n in sorted(profile["by_kind"].items(), key=lambda kv: -kv[1]):
+        print(f"   {kind:<12} {n:>6}")
+
+    print("By intent:")
+    for owner, n in sorted(profile["by_owner"].items(), key=lambda kv: -kv[1]):
+        print(f"   {owner:<22} {n:>6}")
+
+    print(f"Top {top} most expensive rules/examples:")
+    ranked = [p for p in profile["parts"] if p[0][0] in ("rule", "example")]
+    for (kind, owner, text), n in sorted(ranked, key=lambda p: -p[1])[:top]:
+        preview = text.strip().replace("\n", " ")[:70]
+        print(f"   {n:>4}  {kind:<8} {owner:<20} {preview}")
+
+if __name__ == "__main__":
+    from llama_nlu import load_tokenizer
+    tokenizer = load_tokenizer()
+
+    full = profile_prompt(tokenizer)
+    compact = profile_prompt(tokenizer, compact=True)
+    print_profile("FULL PROMPT", full)
+    print_profile("COMPACT PROMPT", compact)
+
+    saved = full["prefill"] - compact["prefill"]
+    print(f"\nPrefill reduction: {saved} tokens per request ({saved / full['prefill']:.1%})")
+
+    # Accuracy check needs the full model; opt in with --eval
+    if "--eval" in sys.argv:
+        print(f"\nEvaluating on {len(LABELED_CORPUS)} labeled commands (greedy decoding)...")
+        full_results = run_corpus(full["system_prompt"])
+        compact_results = run_corpus(compact["system_prompt"])
+
+        print("Disagreements between prompts:")
+        for item, a, b in zip(LABELED_CORPUS, full_results, compact_results):
+            if result_key(a) != result_key(b):
+                print(f"   '{item['user']}' (label: {item['intent']} {item['entities']})")
+                print(f"      full:    {result_key(a)}")
+                print(f"      compact: {result_key(b)}")
+
+        full_scores = score_results(full_results)
+        compact_scores = score_results(compact_results)
+        for metric in ("intent", "entities", "exact"):
+            print(f"{metric:<9} full={full_scores[metric]:.1%} compact={compact_scores[metric]:.1%}")
+
+        if any(compact_scores[m] < full_scores[m] for m in full_scores):
+            print("WARNING: compact prompt loses accuracy, keep USE_COMPACT_PROMPT = False.")
+        else:
+            print("Compact prompt matches full prompt accuracy.")
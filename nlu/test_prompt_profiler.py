@@ -0,0 +1,58 @@
+import re
+from intents import MASTER_INTENTS
+from llama_prompt import _merge_labelled_rules, build_prompt_parts
+from prompt_profiler import count_part_tokens
+
+class StubTokenizer:
+    """Returns fixed offsets, or splits on whitespace when none are given."""
+    def __init__(self, offsets=None):
+        self.offsets = offsets
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=True):
+        offsets = self.offsets
+        if offsets is None:
+            offsets = [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]
+        return {"offset_mapping": offsets}
+
+def test_known_parts_get_their_own_tokens():
+    # Whitespace stub: a part's count must equal the number of words in that part's own text
+    known = [
+        (False, "- Requires a specific filename.\n"),
+        (False, '\nUser: "Order pizza"\nOutput:\n{"intent": "unknown", "confidence": 1.0, "entities": {}}\n'),
+        (True, "- SPECIAL VALUES: If user says 'Last page' or 'End', set page_number to -1. If user says 'First page' or 'Start', set page_number to 1.\n"),
+    ]
+    for compact, text in known:
+        parts = build_prompt_parts(compact)
+        counts = count_part_tokens(StubTokenizer(), parts)
+        index = [part_text for _, _, part_text in parts].index(text)
+        assert counts[index] == len(text.split())
+
+def test_boundary_token_goes_to_earlier_part():
+    parts = [("rule", "a", "abc"), ("rule", "b", "def")]
+    # (2, 4) starts in "abc" and ends in "def"
+    tokenizer = StubTokenizer([(0, 2), (2, 4), (4, 6)])
+    assert count_part_tokens(tokenizer, parts) == [2, 1]
+
+def test_byte_level_tokens_sharing_a_character():
+    # Byte-level BPE can split one Arabic character into tokens with the same offsets
+    parts = [("example", "a", "سم"), ("example", "b", "ّع")]
+    tokenizer = StubTokenizer([(0, 1), (1, 2), (2, 3), (2, 3), (3, 4)])
+    assert count_part_tokens(tokenizer, parts) == [2, 3]
+
+def test_merge_labelled_rules_only_merges_consecutive_labels():
+    rules = ["SPECIAL VALUES: A.", "SPECIAL VALUES: B.", "Other.", "SPECIAL VALUES: C."]
+    assert _merge_labelled_rules(rules) == ["SPECIAL VALUES: A. B.", "Other.", "SPECIAL VALUES: C."]
+
+def test_compact_syntax_rules_keep_literal_tokens():
+    syntax = next(text for kind, _, text in build_prompt_parts(compact=True) if kind == "syntax")
+    lines = syntax.splitlines()
+    assert "','" in lines[0]
+    assert '"confidence": 0.9, "entities"' in lines[0]
+    assert "'}}'" in lines[1]
+    assert "`" not in syntax and "**" not in syntax
+
+def test_compact_examples_keep_spaced_json():
+    # _repair_json_string only finds missing commas when tokens are separated by whitespace
+    examples = [text for kind, _, text in build_prompt_parts(compact=True) if kind == "example"]
+    expected = [ex["json"] for intent in MASTER_INTENTS for ex in intent.examples]
+    assert [text.split(" -> ", 1)[1].rstrip("\n") for text in examples] == expected